@@ -1,14 +1,105 @@
 """Provide utility functions for the bod-diagnostics tool."""
+# Standard Python Libraries
+import contextlib
+import csv
+import sys
 
+# Lookup table used to convert normalized string values into Python booleans.
+_BOOL_MAP = {"true": True, "false": False}
+# Common exact spellings that can be converted without normalizing the value.
+_EXACT_BOOL_MAP = {"True": True, "False": False, "true": True, "false": False}
 
-def convert_booleans(row):
-    """Convert string true/false values into Python booleans in a given row."""
-    for k, v in row.items():
-        if v is None:
+
+@contextlib.contextmanager
+def buffered_stdout(buffer_size=1 << 20):
+    """Provide a text stream that writes to stdout through a large buffer.
+
+    Output is only passed along to stdout when the buffer fills or the context
+    exits, instead of every line being written out as it is produced.
+    """
+    stdout = sys.stdout
+    try:
+        fd = stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # stdout has been replaced with something that is not backed by a file
+        yield stdout
+        return
+
+    # Make sure anything already written to stdout comes first.
+    stdout.flush()
+    # Use closefd=False so that closing this stream leaves stdout open.
+    with open(
+        fd,
+        "w",
+        buffering=buffer_size,
+        encoding=stdout.encoding,
+        errors=stdout.errors,
+        closefd=False,
+    ) as out:
+        yield out
+
+
+def column_indexes(header, columns):
+    """Return the index of each of the given columns in a CSV header row."""
+    indexes = {name: i for i, name in enumerate(header)}
+    return [indexes[column] for column in columns]
+
+
+def convert_booleans(row, columns=None):
+    """Convert string true/false values into Python booleans in a given row.
+
+    If columns is provided then only those columns in the row are converted. A
+    list row can be given along with the indexes of the columns to convert.
+    """
+    for k in row.keys() if columns is None else columns:
+        try:
+            v = row[k]
+        except (IndexError, KeyError):
+            continue
+        if not v:
             continue
-        if v.strip().lower() == "true":
-            row[k] = True
-        elif v.strip().lower() == "false":
-            row[k] = False
+        b = _EXACT_BOOL_MAP.get(v)
+        if b is None:
+            b = _BOOL_MAP.get(v.strip().lower())
+        if b is not None:
+            row[k] = b
 
     return row
+
+
+def read_rows(csv_file, domain_column, domains=None):
+    """Return the header of a report CSV file and an iterator over its rows.
+
+    Rows are read as lists. Blank rows are skipped and short rows are padded
+    with None, the same as csv.DictReader. If domains are provided then only
+    rows whose lowercased domain is one of them are returned. An empty file
+    gives an empty header and no rows.
+    """
+    csv_reader = csv.reader(csv_file)
+    header = next(csv_reader, None)
+    if not header:
+        return [], iter(())
+
+    (domain_index,) = column_indexes(header, [domain_column])
+    return header, _filter_rows(csv_reader, len(header), domain_index, domains)
+
+
+def _filter_rows(csv_reader, row_length, domain_index, domains):
+    """Yield the padded rows from a CSV reader that pass the domain filter."""
+    for row in csv_reader:
+        # Skip blank rows and fill in missing values like csv.DictReader
+        if not row:
+            continue
+        if len(row) < row_length:
+            row.extend([None] * (row_length - len(row)))
+
+        # If we specified domains we check to see if this is one we want
+        if domains and row[domain_index].lower() not in domains:
+            continue
+
+        yield row
+
+
+def split_uris(value):
+    """Split a comma separated string of URIs into a list of normalized URIs."""
+    return [u.strip().lower() for u in value.split(",")]
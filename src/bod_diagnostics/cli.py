@@ -21,7 +21,6 @@ Options:
 """
 
 # Standard Python Libraries
-import csv
 import logging
 
 # Third-Party Libraries
@@ -30,6 +29,9 @@ import docopt
 from ._version import __version__
 from .report_parsers import HTTPSReport, TrustymailReport
 
+# Map each report type option to the parser that handles that report.
+PARSERS = {"--https": HTTPSReport, "--trustymail": TrustymailReport}
+
 
 def setup_logging(debug=False):
     """Set logging level to debug if desired, otherwise set it to warning."""
@@ -47,18 +49,16 @@ def main():
     setup_logging(args["--debug"])
 
     try:
-        with open(args["<csv-file>"], "r") as f:
-            parser = None
-            if args["--https"]:
-                logging.debug("Providing https diagnostics.")
-                parser = HTTPSReport(args["DOMAIN"], args["--csv"])
-            elif args["--trustymail"]:
-                logging.debug("Providing trustymail diagnostics.")
-                parser = TrustymailReport(args["DOMAIN"], args["--csv"])
-
-            csv_reader = csv.DictReader(f)
-            for row in csv_reader:
-                parser.parse_row(row)
+        # The csv module expects files to be opened with newline="", and a
+        # larger buffer reduces the number of reads for large reports.
+        with open(
+            args["<csv-file>"], "r", buffering=1 << 20, encoding="utf-8", newline=""
+        ) as f:
+            report_type = next(option for option in PARSERS if args[option])
+            logging.debug("Providing %s diagnostics.", report_type[2:])
+            parser = PARSERS[report_type](args["DOMAIN"], args["--csv"])
+
+            parser.parse_csv(f)
             parser.output_results()
     except Exception as err:
         logging.error(
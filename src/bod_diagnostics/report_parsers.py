@@ -4,13 +4,151 @@ This module hosts a colletion of classes to parse a given report for more
 detailed information about why a domain is failing BOD 18-01 checks.
 """
 # Standard Python Libraries
-from collections import defaultdict
+from collections import namedtuple
 import csv
+from enum import IntEnum
 import logging
-import sys
+import operator
+import re
 
 from . import _utils
 
+# Column names read from the report CSVs.
+_COL_DOMAIN = "Domain"
+_COL_LIVE = "Live"
+_COL_HSTS_PRELOADED = "Base Domain HSTS Preloaded"
+_COL_SUPPORTS_HTTPS = "Domain Supports HTTPS"
+_COL_ENFORCES_HTTPS = "Domain Enforces HTTPS"
+_COL_STRONG_HSTS = "Domain Uses Strong HSTS"
+_COL_IS_BASE_DOMAIN = "Domain Is Base Domain"
+_COL_VALID_SPF = "Valid SPF"
+_COL_SPF_RECORD = "SPF Record"
+_COL_VALID_DMARC = "Valid DMARC"
+_COL_VALID_BASE_DMARC = "Valid DMARC Record on Base Domain"
+_COL_DMARC_POLICY = "DMARC Policy"
+_COL_DMARC_SUBDOMAIN_POLICY = "DMARC Subdomain Policy"
+_COL_DMARC_PCT = "DMARC Policy Percentage"
+_COL_DMARC_RUA = "DMARC Aggregate Report URIs"
+_COL_SUPPORTS_SMTP = "Domain Supports SMTP"
+_COL_SUPPORTS_STARTTLS = "Domain Supports STARTTLS"
+_COL_WEAK_CRYPTO = "Domain Supports Weak Crypto"
+
+# The columns read from a trustymail report, in the order they are passed to
+# TrustymailReport._add_result().
+_TRUSTYMAIL_COLUMNS = [
+    _COL_DOMAIN,
+    _COL_IS_BASE_DOMAIN,
+    _COL_VALID_SPF,
+    _COL_SPF_RECORD,
+    _COL_VALID_DMARC,
+    _COL_VALID_BASE_DMARC,
+    _COL_DMARC_POLICY,
+    _COL_DMARC_SUBDOMAIN_POLICY,
+    _COL_DMARC_PCT,
+    _COL_DMARC_RUA,
+    _COL_SUPPORTS_SMTP,
+    _COL_SUPPORTS_STARTTLS,
+    _COL_WEAK_CRYPTO,
+]
+
+# The columns read by each report that hold true/false values and need to be
+# converted to booleans.
+_HTTPS_BOOL_COLUMNS = frozenset(
+    [
+        _COL_LIVE,
+        _COL_HSTS_PRELOADED,
+        _COL_SUPPORTS_HTTPS,
+        _COL_ENFORCES_HTTPS,
+        _COL_STRONG_HSTS,
+    ]
+)
+_TRUSTYMAIL_BOOL_COLUMNS = frozenset(
+    [
+        _COL_IS_BASE_DOMAIN,
+        _COL_VALID_SPF,
+        _COL_SPF_RECORD,
+        _COL_VALID_DMARC,
+        _COL_VALID_BASE_DMARC,
+        _COL_SUPPORTS_SMTP,
+        _COL_SUPPORTS_STARTTLS,
+        _COL_WEAK_CRYPTO,
+    ]
+)
+
+
+class _TrustymailCount(IntEnum):
+    """Index into the trustymail tallies for each outcome of the BOD checks."""
+
+    total_domains = 0
+    domains_checked = 1
+    domains_skipped = 2
+    smtp_valid = 3
+    smtp_invalid = 4
+    spf_covered = 5
+    spf_not_covered = 6
+    no_weak_crypto = 7
+    has_weak_crypto = 8
+    dmarc_valid = 9
+    dmarc_invalid = 10
+    bod_compliant = 11
+    bod_failed = 12
+
+
+def _trustymail_outcome_counts():
+    """Map each trustymail check outcome to every tally that it increments.
+
+    A domain is counted as passing each check it made it through before being
+    counted against the check it failed.
+    """
+    checks = [
+        (_TrustymailCount.domains_checked, _TrustymailCount.domains_skipped),
+        (_TrustymailCount.smtp_valid, _TrustymailCount.smtp_invalid),
+        (_TrustymailCount.spf_covered, _TrustymailCount.spf_not_covered),
+        (_TrustymailCount.no_weak_crypto, _TrustymailCount.has_weak_crypto),
+        (_TrustymailCount.dmarc_valid, _TrustymailCount.dmarc_invalid),
+        (_TrustymailCount.bod_compliant, _TrustymailCount.bod_failed),
+    ]
+    outcome_counts = {}
+    passed = [_TrustymailCount.total_domains]
+    for passing, failing in checks:
+        outcome_counts[failing] = tuple(passed + [failing])
+        passed.append(passing)
+    outcome_counts[_TrustymailCount.bod_compliant] = tuple(passed)
+
+    return outcome_counts
+
+
+_TRUSTYMAIL_OUTCOME_COUNTS = _trustymail_outcome_counts()
+
+
+# A failing domain's values, in the same order as HTTPSReport.plain_values,
+# followed by its scores.
+_HTTPSResult = namedtuple(
+    "_HTTPSResult",
+    [
+        "live",
+        "hsts_preloaded",
+        "supports_https",
+        "enforces_https",
+        "strong_hsts",
+        "scores",
+    ],
+)
+
+
+def _score_https(fallback_check, supports_https, enforces_https, strong_hsts):
+    """Calculate the HTTPSReport.scoring values for a domain.
+
+    This only operates on the values pulled from a row so that the scoring is
+    kept separate from how the report is read.
+    """
+    return (
+        (supports_https or fallback_check),
+        (enforces_https or fallback_check),
+        (strong_hsts or fallback_check),
+        ((supports_https and enforces_https and strong_hsts) or fallback_check),
+    )
+
 
 class HTTPSReport:
     """Class to analyze a pshtt produced HTTPS report for errors.
@@ -36,87 +174,119 @@ class HTTPSReport:
         "or ('Live' and 'Base Domain HSTS Preloaded'))",
     }
 
+    csv_fieldnames = (
+        ["Domain"]
+        + plain_values
+        + [f"{name} - {desc}" for name, desc in scoring.items()]
+    )
+
     def __init__(self, domains=None, csv_output=False):
         """Set up internal variables."""
-        self._domains = domains if domains else []
-        self._domains = [domain.lower() for domain in self._domains]
-        logging.debug(f"Domains provided: {self._domains}")
+        self._domains = frozenset(domain.lower() for domain in domains or ())
+        logging.debug("Domains provided: %s", sorted(self._domains))
         self.csv_output = csv_output
         self._results = {}
 
-    def _output_record(self, domain, values, csv_writer=None):
-        if csv_writer:
-            row = {"Domain": domain}
-            for value in self.plain_values:
-                row[value] = values[value]
-            i = 0
-            for score, desc in self.scoring.items():
-                row[f"{score} - {desc}"] = values["Scores"][i]
-                i += 1
-            csv_writer.writerow(row)
-        else:
-            print(f"  {domain}")
-            print("    pshtt Values:")
-            for value in self.plain_values:
-                print(f"      {value}: {values[value]}")
-            print("    Scores:")
-            i = 0
-            for score, desc in self.scoring.items():
-                print(f"      {score} : {desc}")
-                print(f"      = {values['Scores'][i]}")
-                i += 1
-
     def output_results(self):
         """Print the results of analysis."""
-        csv_writer = None
-        if self.csv_output:
-            csv_fieldnames = ["Domain"]
-            csv_fieldnames.extend(self.plain_values)
-            for name, desc in self.scoring.items():
-                csv_fieldnames.append(f"{name} - {desc}")
-            csv_writer = csv.DictWriter(sys.stdout, csv_fieldnames)
-            csv_writer.writeheader()
-        else:
-            print("Domains with Failing Checks ::")
-
-        for k, v in self._results.items():
-            if False not in v["Scores"]:
-                continue
+        plain_values = self.plain_values
+        # The description of each score is the same for every domain
+        score_descriptions = [
+            f"      {score} : {desc}" for score, desc in self.scoring.items()
+        ]
+        with _utils.buffered_stdout() as out:
+            if self.csv_output:
+                csv_writer = csv.writer(out)
+                csv_writer.writerow(self.csv_fieldnames)
+
+                for domain, result in self._results.items():
+                    if result is None:
+                        continue
+                    row = [domain]
+                    row.extend(result[:-1])
+                    row.extend(result.scores)
+                    csv_writer.writerow(row)
             else:
-                self._output_record(k, v, csv_writer)
+                out.write("Domains with Failing Checks ::\n")
+
+                for domain, result in self._results.items():
+                    if result is None:
+                        continue
+                    # Build the whole record so it can be written in a single call.
+                    lines = [f"  {domain}", "    pshtt Values:"]
+                    for name, value in zip(plain_values, result):
+                        lines.append(f"      {name}: {value}")
+                    lines.append("    Scores:")
+                    for desc, score in zip(score_descriptions, result.scores):
+                        lines.append(desc)
+                        lines.append(f"      = {score}")
+                    lines.append("")
+                    out.write("\n".join(lines))
+
+    def _add_result(
+        self, domain, live, hsts_preloaded, supports_https, enforces_https, strong_hsts
+    ):
+        """Score a domain's values and keep the result if any of the scores fail."""
+        scores = _score_https(
+            live and hsts_preloaded, supports_https, enforces_https, strong_hsts
+        )
+        # Only domains with a failing score are output. A passing domain is kept
+        # as None so that a later row for the same domain replaces the result
+        # without changing the order domains are output in.
+        if False not in scores:
+            self._results[domain] = None
+            return
+
+        self._results[domain] = _HTTPSResult(
+            live, hsts_preloaded, supports_https, enforces_https, strong_hsts, scores
+        )
+
+    def parse_csv(self, csv_file):
+        """Parse every row of a provided pshtt results CSV file.
+
+        Rows are read as lists and only the columns used for scoring are looked
+        at, so no dictionary is built for any row. Failing domains are stored as
+        _HTTPSResult records.
+        """
+        header, rows = _utils.read_rows(csv_file, _COL_DOMAIN, self._domains)
+        if not header:
+            return
+
+        domain_index, *value_indexes = _utils.column_indexes(
+            header,
+            [
+                _COL_DOMAIN,
+                _COL_LIVE,
+                _COL_HSTS_PRELOADED,
+                _COL_SUPPORTS_HTTPS,
+                _COL_ENFORCES_HTTPS,
+                _COL_STRONG_HSTS,
+            ],
+        )
+        get_values = operator.itemgetter(*value_indexes)
+        add_result = self._add_result
+
+        for row in rows:
+            _utils.convert_booleans(row, value_indexes)
+            add_result(row[domain_index].lower(), *get_values(row))
 
     def parse_row(self, csv_row):
         """Parse a provided CSV file to provide pshtt diagnostic information."""
-        result_dict = {}
+        domain = csv_row[_COL_DOMAIN].lower()
 
         # If we specified domains we check to see if this is one we want
-        if self._domains:
-            if csv_row["Domain"].lower() not in self._domains:
-                return
-
-        csv_row = _utils.convert_booleans(csv_row)
-        domain_live = csv_row["Live"]
-        domain_hsts_preload = csv_row["Base Domain HSTS Preloaded"]
-        domain_fallback_check = domain_live and domain_hsts_preload
-        domain_supports_https = csv_row["Domain Supports HTTPS"]
-        domain_enforces_https = csv_row["Domain Enforces HTTPS"]
-        domain_strong_hsts = csv_row["Domain Uses Strong HSTS"]
-
-        result_dict["Live"] = domain_live
-        result_dict["Base Domain HSTS Preloaded"] = domain_hsts_preload
-        result_dict["Domain Supports HTTPS"] = domain_supports_https
-        result_dict["Domain Enforces HTTPS"] = domain_enforces_https
-        result_dict["Domain Uses Strong HSTS"] = domain_strong_hsts
-        result_dict["Scores"] = [
-            (domain_supports_https or domain_fallback_check),
-            (domain_enforces_https or domain_fallback_check),
-            (domain_strong_hsts or domain_fallback_check),
-            (
-                (domain_supports_https and domain_enforces_https and domain_strong_hsts)
-                or domain_fallback_check
-            ),
-        ]
-        self._results[csv_row["Domain"].lower()] = result_dict
+        if self._domains and domain not in self._domains:
+            return
+
+        csv_row = _utils.convert_booleans(csv_row, _HTTPS_BOOL_COLUMNS)
+        self._add_result(
+            domain,
+            csv_row[_COL_LIVE],
+            csv_row[_COL_HSTS_PRELOADED],
+            csv_row[_COL_SUPPORTS_HTTPS],
+            csv_row[_COL_ENFORCES_HTTPS],
+            csv_row[_COL_STRONG_HSTS],
+        )
 
 
 class TrustymailReport:
@@ -129,6 +299,10 @@ class TrustymailReport:
     """
 
     bod_rua_url = "mailto:reports@dmarc.cyber.dhs.gov"
+    # Matches the BOD RUA URL as an entry in a comma separated list of URIs.
+    _bod_rua_url_re = re.compile(
+        r"(?:^|,)\s*" + re.escape(bod_rua_url) + r"\s*(?:,|\Z)", re.IGNORECASE
+    )
 
     plain_values = [
         "Base Domain",
@@ -144,150 +318,244 @@ class TrustymailReport:
         "'Valid DMARC' and 'Policy Percentage' == 100",
     ]
 
+    rua_title = f"RUA URLs (should contain '{bod_rua_url}')"
+
+    csv_fieldnames = ["Domain"] + plain_values + conditions + [rua_title]
+
     def __init__(self, domains=None, csv_output=False):
         """Set up internal variables."""
-        self._domains = domains if domains else []
-        self._domains = [domain.lower() for domain in self._domains]
-        logging.debug(f"Domains provided: {self._domains}")
+        self._domains = frozenset(domain.lower() for domain in domains or ())
+        logging.debug("Domains provided: %s", sorted(self._domains))
 
         self.csv_output = csv_output
-        self._count_values = defaultdict(lambda: 0)
+        # The number of domains with each check outcome, indexed by the
+        # _TrustymailCount of the outcome
+        self._outcome_counts = [0] * len(_TrustymailCount)
         self._failed_domains = []
 
     def output_results(self):
         """Print the results of analysis."""
-        if self.csv_output:
-            csv_fieldnames = ["Domain"]
-            csv_fieldnames.extend(self.plain_values)
-            csv_fieldnames.extend(self.conditions)
-            csv_fieldnames.append(f"RUA URLs (should contain '{self.bod_rua_url}')")
-            csv_writer = csv.DictWriter(sys.stdout, csv_fieldnames)
-            csv_writer.writeheader()
-
-            for record in self._failed_domains:
-                row = {"Domain": record["domain"]}
-                for value in self.plain_values:
-                    row[value] = record["result"][value]
-                i = 0
-                for condition in self.conditions:
-                    row[condition] = record["result"]["Conditions"][i]
-                    i += 1
-                row[f"RUA URLs (should contain '{self.bod_rua_url}')"] = ";".join(
-                    record["result"]["RUA URLs"]
+        plain_values = self.plain_values
+        conditions = self.conditions
+        rua_title = self.rua_title
+        with _utils.buffered_stdout() as out:
+            if self.csv_output:
+                csv_writer = csv.writer(out)
+                csv_writer.writerow(self.csv_fieldnames)
+
+                for record in self._failed_domains:
+                    result = record["result"]
+                    row = [record["domain"]]
+                    row.extend(result[value] for value in plain_values)
+                    row.extend(result["Conditions"])
+                    row.append(";".join(result["RUA URLs"]))
+                    csv_writer.writerow(row)
+            else:
+                # Everything but the RUA URLs is laid out the same way for every
+                # failed domain, so the labels are only formatted once.
+                record_template = "\n".join(
+                    ["  {}"]
+                    + [f"    {value} : {{}}" for value in plain_values]
+                    + ["    Conditions (must be true):"]
+                    + [f"      {d} : {{}}" for d in conditions]
                 )
-                csv_writer.writerow(row)
-        else:
-            for record in self._failed_domains:
-                print(f"  {record['domain']}")
-                for value in self.plain_values:
-                    print(f"    {value} : {record['result'][value]}")
-                print("    Conditions (must be true):")
-                for d, c in zip(self.conditions, record["result"]["Conditions"]):
-                    print(f"      {d} : {c}")
-                if len(record["result"]["RUA URLs"]) > 0:
-                    print(f"    RUA URLs (should contain '{self.bod_rua_url}'):")
-                    for url in record["result"]["RUA URLs"]:
-                        print(f"      {url}")
-            print()
-
-            for k, v in self._count_values.items():
-                print(f"{k} :: {v}")
-
-    def parse_row(self, csv_row):
-        """Parse a provided CSV file to provide trustymail diagnostic information."""
-        # If we specified domains we check to see if this is one we want
-        if self._domains:
-            if csv_row["Domain"].lower() not in self._domains:
-                return
-
-        csv_row = _utils.convert_booleans(csv_row)
-
-        self._count_values["total_domains"] += 1
-
-        valid_dmarc = (
-            csv_row["Valid DMARC"] or csv_row["Valid DMARC Record on Base Domain"]
-        )
-        valid_dmarc_policy_reject = valid_dmarc and (
-            csv_row["DMARC Policy"] == "reject"
+                for record in self._failed_domains:
+                    result = record["result"]
+                    # Build the whole record so it can be written in a single call.
+                    lines = [
+                        record_template.format(
+                            record["domain"],
+                            *(result[value] for value in plain_values),
+                            *result["Conditions"],
+                        )
+                    ]
+                    if len(result["RUA URLs"]) > 0:
+                        lines.append(f"    {rua_title}:")
+                        for url in result["RUA URLs"]:
+                            lines.append(f"      {url}")
+                    lines.append("")
+                    out.write("\n".join(lines))
+
+                count_values = self._count_values()
+                lines = [""]
+                for count in _TrustymailCount:
+                    lines.append(f"{count.name} :: {count_values[count]}")
+                lines.append("")
+                out.write("\n".join(lines))
+
+    def _count_values(self):
+        """Return the value of every trustymail tally, indexed by _TrustymailCount.
+
+        Each domain is counted under its outcome while parsing, so the tallies
+        it also passed through are only added up here.
+        """
+        count_values = [0] * len(_TrustymailCount)
+        for outcome, counts in _TRUSTYMAIL_OUTCOME_COUNTS.items():
+            outcome_count = self._outcome_counts[outcome]
+            for count in counts:
+                count_values[count] += outcome_count
+
+        return count_values
+
+    def parse_csv(self, csv_file):
+        """Parse every row of a provided trustymail results CSV file.
+
+        Rows are read as lists and only the columns used for the BOD checks are
+        looked at, so no dictionary is built for any row.
+        """
+        header, rows = _utils.read_rows(csv_file, _COL_DOMAIN, self._domains)
+        if not header:
+            return
+
+        get_values = operator.itemgetter(
+            *_utils.column_indexes(header, _TRUSTYMAIL_COLUMNS)
         )
+        bool_indexes = _utils.column_indexes(header, _TRUSTYMAIL_BOOL_COLUMNS)
+        add_result = self._add_result
+
+        for row in rows:
+            _utils.convert_booleans(row, bool_indexes)
+            add_result(*get_values(row))
+
+    @staticmethod
+    def _dmarc_conditions(
+        is_base,
+        valid_dmarc,
+        valid_base_dmarc,
+        dmarc_policy,
+        dmarc_subdomain_policy,
+        dmarc_pct,
+    ):
+        """Return DMARC validity and the BOD 18-01 DMARC conditions for a row."""
+        valid_dmarc = valid_dmarc or valid_base_dmarc
+        valid_dmarc_policy_reject = valid_dmarc and (dmarc_policy == "reject")
         valid_dmarc_subdomain_policy_reject = valid_dmarc and (
-            not csv_row["Domain Is Base Domain"]
-            or (csv_row["DMARC Subdomain Policy"] == "reject")
+            not is_base or (dmarc_subdomain_policy == "reject")
         )
-        valid_dmarc_policy_pct = valid_dmarc and (
-            csv_row["DMARC Policy Percentage"] == "100"
-        )
-        valid_dmarc_policy_of_reject = (
-            valid_dmarc_policy_reject
-            and valid_dmarc_subdomain_policy_reject
-            and valid_dmarc_policy_pct
+        valid_dmarc_policy_pct = valid_dmarc and (dmarc_pct == "100")
+
+        return valid_dmarc, (
+            valid_dmarc_policy_reject,
+            valid_dmarc_subdomain_policy_reject,
+            valid_dmarc_policy_pct,
         )
 
-        if csv_row["Domain Is Base Domain"]:
-            spf_covered = csv_row["Valid SPF"]
-        else:
-            spf_covered = csv_row["Valid SPF"] or (
-                (not csv_row["SPF Record"]) and valid_dmarc_policy_of_reject
+    def _classify_row(
+        self,
+        is_base,
+        valid_spf,
+        spf_record,
+        valid_dmarc,
+        valid_base_dmarc,
+        dmarc_policy,
+        dmarc_subdomain_policy,
+        dmarc_pct,
+        dmarc_rua,
+        supports_smtp,
+        supports_starttls,
+        weak_crypto,
+    ):
+        """Run the BOD 18-01 email checks for a row and return the outcome.
+
+        The checks are run in order and the outcome is the _TrustymailCount of
+        the first check that fails, or bod_compliant if every check passes. The
+        DMARC validity and conditions are also returned if they were evaluated.
+        """
+        if not (is_base or supports_smtp):
+            return _TrustymailCount.domains_skipped, None
+
+        if not (supports_starttls or not supports_smtp):
+            return _TrustymailCount.smtp_invalid, None
+
+        # The DMARC conditions are only needed for SPF coverage when a
+        # subdomain without a valid SPF record has no SPF record at all.
+        dmarc_conditions = None
+        spf_covered = valid_spf
+        if not (spf_covered or is_base or spf_record):
+            dmarc_conditions = self._dmarc_conditions(
+                is_base,
+                valid_dmarc,
+                valid_base_dmarc,
+                dmarc_policy,
+                dmarc_subdomain_policy,
+                dmarc_pct,
             )
+            spf_covered = all(dmarc_conditions[1])
+        if not spf_covered:
+            return _TrustymailCount.spf_not_covered, dmarc_conditions
+
+        if weak_crypto:
+            return _TrustymailCount.has_weak_crypto, dmarc_conditions
+
+        if dmarc_conditions is None:
+            dmarc_conditions = self._dmarc_conditions(
+                is_base,
+                valid_dmarc,
+                valid_base_dmarc,
+                dmarc_policy,
+                dmarc_subdomain_policy,
+                dmarc_pct,
+            )
+        if not all(dmarc_conditions[1]):
+            return _TrustymailCount.dmarc_invalid, dmarc_conditions
 
-        valid_dmarc_bod1801_rua_url = False
-        if valid_dmarc:
-            if self.bod_rua_url in [
-                u.strip().lower()
-                for u in csv_row["DMARC Aggregate Report URIs"].split(",")
-            ]:
-                valid_dmarc_bod1801_rua_url = True
-
-        if csv_row["Domain Is Base Domain"] or (
-            not csv_row["Domain Is Base Domain"] and csv_row["Domain Supports SMTP"]
-        ):
-            self._count_values["domains_checked"] += 1
-            if (
-                csv_row["Domain Supports SMTP"] and csv_row["Domain Supports STARTTLS"]
-            ) or (not csv_row["Domain Supports SMTP"]):
-                self._count_values["smtp_valid"] += 1
-                if spf_covered:
-                    self._count_values["spf_covered"] += 1
-                    if not csv_row["Domain Supports Weak Crypto"]:
-                        self._count_values["no_weak_crypto"] += 1
-                        if valid_dmarc_policy_of_reject:
-                            self._count_values["dmarc_valid"] += 1
-                            if valid_dmarc_bod1801_rua_url:
-                                self._count_values["bod_compliant"] += 1
-                            else:
-                                self._count_values["bod_failed"] += 1
-                        else:
-                            self._count_values["dmarc_invalid"] += 1
-                            result = {
-                                "Base Domain": csv_row["Domain Is Base Domain"],
-                                "Valid DMARC": valid_dmarc,
-                                "DMARC Policy": csv_row["DMARC Policy"],
-                                "DMARC Subdomain Policy": csv_row[
-                                    "DMARC Subdomain Policy"
-                                ],
-                                "DMARC Policy Percentage": csv_row[
-                                    "DMARC Policy Percentage"
-                                ],
-                                "Conditions": [
-                                    valid_dmarc_policy_reject,
-                                    valid_dmarc_subdomain_policy_reject,
-                                    valid_dmarc_policy_pct,
-                                ],
-                                "RUA URLs": [
-                                    u.strip().lower()
-                                    for u in csv_row[
-                                        "DMARC Aggregate Report URIs"
-                                    ].split(",")
-                                ],
-                            }
-                            self._failed_domains.append(
-                                {"domain": csv_row["Domain"], "result": result}
-                            )
-                    else:
-                        self._count_values["has_weak_crypto"] += 1
-                else:
-                    self._count_values["spf_not_covered"] += 1
-            else:
-                self._count_values["smtp_invalid"] += 1
-        else:
-            self._count_values["domains_skipped"] += 1
+        if not self._bod_rua_url_re.search(dmarc_rua):
+            return _TrustymailCount.bod_failed, dmarc_conditions
+
+        return _TrustymailCount.bod_compliant, dmarc_conditions
+
+    def parse_row(self, csv_row):
+        """Parse a provided CSV file to provide trustymail diagnostic information."""
+        # If we specified domains we check to see if this is one we want
+        if self._domains and csv_row[_COL_DOMAIN].lower() not in self._domains:
+            return
+
+        csv_row = _utils.convert_booleans(csv_row, _TRUSTYMAIL_BOOL_COLUMNS)
+        self._add_result(*(csv_row[column] for column in _TRUSTYMAIL_COLUMNS))
+
+    def _add_result(
+        self,
+        domain,
+        is_base,
+        valid_spf,
+        spf_record,
+        valid_dmarc,
+        valid_base_dmarc,
+        dmarc_policy,
+        dmarc_subdomain_policy,
+        dmarc_pct,
+        dmarc_rua,
+        supports_smtp,
+        supports_starttls,
+        weak_crypto,
+    ):
+        """Classify a row and add it to the tallies and any failed domains."""
+        outcome, dmarc_conditions = self._classify_row(
+            is_base,
+            valid_spf,
+            spf_record,
+            valid_dmarc,
+            valid_base_dmarc,
+            dmarc_policy,
+            dmarc_subdomain_policy,
+            dmarc_pct,
+            dmarc_rua,
+            supports_smtp,
+            supports_starttls,
+            weak_crypto,
+        )
+
+        self._outcome_counts[outcome] += 1
+
+        if outcome == _TrustymailCount.dmarc_invalid:
+            valid_dmarc, conditions = dmarc_conditions
+            result = {
+                "Base Domain": is_base,
+                "Valid DMARC": valid_dmarc,
+                "DMARC Policy": dmarc_policy,
+                "DMARC Subdomain Policy": dmarc_subdomain_policy,
+                "DMARC Policy Percentage": dmarc_pct,
+                "Conditions": conditions,
+                "RUA URLs": _utils.split_uris(dmarc_rua),
+            }
+            self._failed_domains.append({"domain": domain, "result": result})
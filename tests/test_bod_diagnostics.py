@@ -2,6 +2,8 @@
 """Tests for bod-diagnostics."""
 
 # Standard Python Libraries
+import csv
+import io
 import os
 import sys
 from unittest.mock import patch
@@ -10,7 +12,12 @@ from unittest.mock import patch
 import pytest
 
 # Local Libraries
-from bod_diagnostics import cli
+from bod_diagnostics import _utils, cli
+from bod_diagnostics.report_parsers import (
+    HTTPSReport,
+    TrustymailReport,
+    _TrustymailCount,
+)
 
 # define sources of version strings
 RELEASE_TAG = os.getenv("RELEASE_TAG")
@@ -53,3 +60,224 @@ def test_release_version():
     assert (
         RELEASE_TAG == f"v{PROJECT_VERSION}"
     ), "RELEASE_TAG does not match the project version"
+
+
+def test_convert_booleans():
+    """Verify that only true/false string values are converted to booleans."""
+    row = {"a": " True ", "b": "false", "c": "reject", "d": "", "e": None}
+    assert _utils.convert_booleans(row) == {
+        "a": True,
+        "b": False,
+        "c": "reject",
+        "d": "",
+        "e": None,
+    }
+    row = {"a": "True", "b": "false"}
+    assert _utils.convert_booleans(row, ["a", "c"]) == {"a": True, "b": "false"}
+
+
+HTTPS_FIELDS = [
+    "Domain",
+    "Live",
+    "Base Domain HSTS Preloaded",
+    "Domain Supports HTTPS",
+    "Domain Enforces HTTPS",
+    "Domain Uses Strong HSTS",
+]
+HTTPS_CSV = "\n".join(
+    [
+        ",".join(HTTPS_FIELDS),
+        "Pass.gov,True,False,True,True,True",
+        "ok.gov,True,False,True,True,True",
+        "fail.gov,True,False,True,False,True",
+        "",
+        "blank.gov,True,False,True,True,",
+        "short.gov,True,False,True",
+        "pass.gov,False,False,False,True,True",
+    ]
+)
+# The domains from HTTPS_CSV that should be output, in order, along with their
+# pshtt values and scores. The only passing domain, ok.gov, must not be output.
+HTTPS_FAILURES = [
+    ("pass.gov", [False, False, False, True, True], [False, True, True, False]),
+    ("fail.gov", [True, False, True, False, True], [True, False, True, False]),
+    ("blank.gov", [True, False, True, True, ""], [True, True, False, False]),
+    ("short.gov", [True, False, True, None, None], [True, False, False, False]),
+]
+
+
+def test_https_output(capsys):
+    """Verify the text output of failing domains from a pshtt report."""
+    parser = HTTPSReport()
+    parser.parse_csv(io.StringIO(HTTPS_CSV))
+    parser.output_results()
+
+    lines = ["Domains with Failing Checks ::"]
+    for domain, values, scores in HTTPS_FAILURES:
+        lines.extend([f"  {domain}", "    pshtt Values:"])
+        for name, value in zip(HTTPSReport.plain_values, values):
+            lines.append(f"      {name}: {value}")
+        lines.append("    Scores:")
+        for (score, desc), result in zip(HTTPSReport.scoring.items(), scores):
+            lines.extend([f"      {score} : {desc}", f"      = {result}"])
+    out = capsys.readouterr().out
+    assert "ok.gov" not in out
+    assert out == "\n".join(lines) + "\n"
+
+
+def test_https_csv_output(capsys):
+    """Verify the CSV output of failing domains from a pshtt report."""
+    parser = HTTPSReport(csv_output=True)
+    parser.parse_csv(io.StringIO(HTTPS_CSV))
+    parser.output_results()
+
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+    assert "ok.gov" not in [row[0] for row in rows]
+    assert rows[0] == HTTPSReport.csv_fieldnames
+    assert rows[1:] == [
+        [domain] + ["" if v is None else str(v) for v in values + scores]
+        for domain, values, scores in HTTPS_FAILURES
+    ]
+
+
+BOD_RUA = TrustymailReport.bod_rua_url
+TRUSTYMAIL_FIELDS = [
+    "Domain",
+    "Domain Is Base Domain",
+    "Valid SPF",
+    "SPF Record",
+    "Valid DMARC",
+    "Valid DMARC Record on Base Domain",
+    "DMARC Policy",
+    "DMARC Subdomain Policy",
+    "DMARC Policy Percentage",
+    "DMARC Aggregate Report URIs",
+    "Domain Supports SMTP",
+    "Domain Supports STARTTLS",
+    "Domain Supports Weak Crypto",
+]
+TRUSTYMAIL_CSV = "\n".join(
+    [
+        ",".join(TRUSTYMAIL_FIELDS),
+        f"compliant.gov,True,True,True,True,False,reject,reject,100,{BOD_RUA},True,True,False",
+        "norua.gov,True,True,True,True,False,reject,reject,100,mailto:a@b.gov,True,True,False",
+        "skipped.gov,False,False,False,False,False,,,,,False,False,False",
+        "nostarttls.gov,True,True,True,True,False,reject,reject,100,,True,False,False",
+        "nospf.gov,True,False,True,True,False,reject,reject,100,,True,True,False",
+        f"spfbydmarc.gov,False,False,False,False,True,reject,,100,{BOD_RUA},True,True,False",
+        "weak.gov,True,True,True,True,False,reject,reject,100,,True,True,True",
+        "none.gov,True,True,True,True,False,none,none,50,mailto:a@b.gov,True,True,False",
+    ]
+)
+
+
+def test_trustymail_counts():
+    """Verify that trustymail rows are counted at the first failing check."""
+    parser = TrustymailReport()
+    parser.parse_csv(io.StringIO(TRUSTYMAIL_CSV))
+    count_values = parser._count_values()
+    assert {c.name: count_values[c] for c in _TrustymailCount} == {
+        "total_domains": 8,
+        "domains_skipped": 1,
+        "domains_checked": 7,
+        "smtp_invalid": 1,
+        "smtp_valid": 6,
+        "spf_not_covered": 1,
+        "spf_covered": 5,
+        "has_weak_crypto": 1,
+        "no_weak_crypto": 4,
+        "dmarc_valid": 3,
+        "dmarc_invalid": 1,
+        "bod_compliant": 2,
+        "bod_failed": 1,
+    }
+    assert [r["domain"] for r in parser._failed_domains] == ["none.gov"]
+    assert parser._failed_domains[0]["result"]["Conditions"] == (False, False, False)
+
+
+def test_trustymail_output(capsys):
+    """Verify the trustymail text output lists every tally, including zeros."""
+    parser = TrustymailReport(["compliant.gov", "NONE.gov"])
+    parser.parse_csv(io.StringIO(TRUSTYMAIL_CSV))
+    parser.output_results()
+    assert capsys.readouterr().out == "\n".join(
+        [
+            "  none.gov",
+            "    Base Domain : True",
+            "    Valid DMARC : True",
+            "    DMARC Policy : none",
+            "    DMARC Subdomain Policy : none",
+            "    DMARC Policy Percentage : 50",
+            "    Conditions (must be true):",
+            *(f"      {condition} : False" for condition in parser.conditions),
+            f"    {parser.rua_title}:",
+            "      mailto:a@b.gov",
+            "",
+            "total_domains :: 2",
+            "domains_checked :: 2",
+            "domains_skipped :: 0",
+            "smtp_valid :: 2",
+            "smtp_invalid :: 0",
+            "spf_covered :: 2",
+            "spf_not_covered :: 0",
+            "no_weak_crypto :: 2",
+            "has_weak_crypto :: 0",
+            "dmarc_valid :: 1",
+            "dmarc_invalid :: 1",
+            "bod_compliant :: 1",
+            "bod_failed :: 0",
+            "",
+        ]
+    )
+
+
+def test_trustymail_csv_output(capsys):
+    """Verify the trustymail CSV output of domains failing the DMARC checks."""
+    parser = TrustymailReport(csv_output=True)
+    parser.parse_csv(io.StringIO(TRUSTYMAIL_CSV))
+    parser.output_results()
+
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+    assert rows == [
+        TrustymailReport.csv_fieldnames,
+        ["none.gov", "True", "True", "none", "none", "50"]
+        + ["False", "False", "False", "mailto:a@b.gov"],
+    ]
+
+
+def test_buffered_stdout(capfd):
+    """Verify that buffered output reaches stdout in order when it has a file."""
+    print("before")
+    with _utils.buffered_stdout() as out:
+        assert out is not sys.stdout
+        out.write("buffered\n")
+    print("after")
+    assert capfd.readouterr().out == "before\nbuffered\nafter\n"
+
+
+def test_buffered_stdout_without_file(capsys):
+    """Verify that stdout is used directly when it is not backed by a file."""
+    with _utils.buffered_stdout() as out:
+        assert out is sys.stdout
+        out.write("unbuffered\n")
+    assert capsys.readouterr().out == "unbuffered\n"
+
+
+@pytest.mark.parametrize(
+    "report,report_csv",
+    [(HTTPSReport, HTTPS_CSV), (TrustymailReport, TRUSTYMAIL_CSV)],
+)
+@pytest.mark.parametrize("domains", [None, ["PASS.gov", "fail.gov", "none.gov"]])
+@pytest.mark.parametrize("csv_output", [False, True])
+def test_parse_row_matches_parse_csv(capsys, report, report_csv, domains, csv_output):
+    """Verify that parsing csv.DictReader rows gives the same output as parse_csv."""
+    parser = report(domains, csv_output)
+    parser.parse_csv(io.StringIO(report_csv))
+    parser.output_results()
+    expected = capsys.readouterr().out
+
+    parser = report(domains, csv_output)
+    for row in csv.DictReader(io.StringIO(report_csv)):
+        parser.parse_row(row)
+    parser.output_results()
+    assert capsys.readouterr().out == expected